@@ -16,9 +16,89 @@ than purely random synthetic data.
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 from scipy import stats
+from scipy.special import expit
+import hashlib
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def _sample_sequences(
+    arrival_days: np.ndarray,
+    n_days: int,
+    carrying_capacity: np.ndarray,
+    growth_rate: float,
+    sample_rate: np.ndarray,
+    rng: np.random.Generator
+) -> tuple:
+    """
+    Draw daily sequence counts for a set of locations from their arrival days on.
+
+    arrival_days, carrying_capacity and sample_rate hold one entry per location;
+    the curve is evaluated in float32 (the rates are float32 arrays).
+    Prevalence follows a logistic curve centred 60 days after arrival. Only
+    days from the first detectable day after arrival on are evaluated, laid
+    out flat location by location.
+    Days expecting more than 0.05 sequences draw a Poisson count (mean
+    floored at 1), all in a single call; returns the location positions, day
+    indices and counts of the non-zero draws.
+    """
+    # The curve only rises, so each location is detectable from one day on:
+    # solving K * rate * expit(r * (d - 60)) = 0.05 gives that day. Starting a
+    # day early absorbs float32 rounding; the threshold is still applied per day
+    peak_expected = carrying_capacity.astype(np.float64) * sample_rate
+    with np.errstate(divide='ignore', invalid='ignore'):
+        threshold_day = 60 - np.log(peak_expected / 0.05 - 1) / growth_rate
+    first_day = np.where(peak_expected > 0.05, np.clip(np.floor(threshold_day) - 1, 0, n_days), n_days)
+    skip = np.maximum(first_day.astype(np.int64), -arrival_days)
+
+    n_active = np.clip(n_days - arrival_days - skip, 0, n_days)
+    location_pos = np.repeat(np.arange(len(arrival_days)), n_active)
+    run_start = np.repeat(np.cumsum(n_active) - n_active, n_active)
+    days_since_arrival = np.arange(len(location_pos)) - run_start + skip[location_pos]
+    days = arrival_days[location_pos] + days_since_arrival
+
+    # The logistic depends only on days since arrival, so it is evaluated once
+    # per distinct day offset and gathered, then scaled in place by capacity
+    # and sampling rate
+    logistic = np.arange(days_since_arrival.max(initial=-1) + 1, dtype=np.float32)
+    logistic -= 60
+    logistic *= np.float32(growth_rate)
+    expit(logistic, out=logistic)
+    expected_sequences = logistic[days_since_arrival]
+    expected_sequences *= carrying_capacity[location_pos]
+    expected_sequences *= sample_rate[location_pos]
+
+    sampled = expected_sequences > 0.05
+    sequences = rng.poisson(np.maximum(1, expected_sequences[sampled]))
+    detected = sequences > 0
+    return location_pos[sampled][detected], days[sampled][detected], sequences[detected]
+
+
+def _source_digest() -> str:
+    """Digest of this module's source, so cached datasets expire when the model changes."""
+    with open(__file__, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def _sorted_names(names: list) -> tuple:
+    """
+    Sort names for use as categorical categories.
+
+    Returns the sorted names and, for each original position, its index in
+    that sorted order (the categorical code).
+    """
+    order = np.argsort(names)
+    rank = np.empty(len(names), dtype=np.intp)
+    rank[order] = np.arange(len(names))
+    return np.asarray(names, dtype=object)[order], rank
 
 
 class RealisticEpiSimulator:
@@ -27,7 +107,13 @@ class RealisticEpiSimulator:
     """
 
     def __init__(self, seed: int = 42):
-        np.random.seed(seed)
+        self.seed = seed
+
+        # Own PCG64 generator rather than the global legacy RNG state, with an
+        # independent child stream per dataset so each generator's output does
+        # not depend on which of the others ran first
+        self.rng = np.random.default_rng(seed)
+        self._wastewater_rng, self._variant_rng, self._flight_rng = self.rng.spawn(3)
 
         # All 50 US states with populations (millions), coordinates, and connectivity scores
         self.states = {
@@ -281,6 +367,99 @@ class RealisticEpiSimulator:
             ('Ireland', 'Illinois'): 2000,
         }
 
+        # Structure-of-arrays view of the location registries for the vectorized
+        # generators: US states first, then international locations
+        self._all_locations = {**self.states, **self.international_locations}
+        locations = self._all_locations
+        self._n_states = len(self.states)
+        self._location_names = np.array(list(locations), dtype=object)
+        self._location_index = {name: i for i, name in enumerate(locations)}
+        self._pop = np.array([info['pop'] for info in locations.values()])
+        self._lat = np.array([info.get('lat', 40) for info in locations.values()])
+        self._connectivity = np.array([info['connectivity'] for info in locations.values()])
+        self._sequencing_capacity = np.array([info.get('sequencing_capacity', 0.5) for info in locations.values()])
+
+        # International route volume as a (country, state) matrix
+        self._intl_route_volume = np.zeros((len(locations), len(locations)))
+        for (country, state), volume in self.international_routes.items():
+            self._intl_route_volume[self._location_index[country], self._location_index[state]] = volume
+
+        # Pairwise latitude distance, the spread-distance proxy for
+        # domestic-origin variants
+        self._lat_dist = np.abs(self._lat[:, None] - self._lat[None, :])
+
+        # Variant-independent sequencing model terms per location: logistic
+        # carrying capacity and daily sampling rate (US sampling is higher for hub
+        # states; international detection scales with sequencing capacity)
+        is_state = np.arange(len(locations)) < self._n_states
+        self._carrying_capacity = np.maximum(self._pop * np.where(is_state, 50, 30), 100).astype(np.float32)
+        self._sample_rate = np.where(
+            is_state,
+            0.01 * (0.5 + self._connectivity),
+            0.008 * self._sequencing_capacity * (0.5 + self._connectivity),
+        ).astype(np.float32)
+
+        # Parse variant timeline dates once rather than on every generator call
+        for v_info in self.variants.values():
+            v_info['_emergence_ts'] = pd.Timestamp(v_info['emergence_date'])
+            v_info['_peak_ts'] = pd.Timestamp(v_info['peak_date'])
+            v_info['_peak_days'] = (v_info['_peak_ts'] - v_info['_emergence_ts']).days
+
+            # Origin location indices (-1 when not a known location) and the US
+            # entry-point mask over the location arrays
+            v_info['_origin_idx'] = self._location_index.get(v_info['origin'], -1)
+            v_info['_origin_state_idx'] = self._location_index.get(v_info.get('origin_state'), -1)
+            v_info['_entry_mask'] = np.isin(
+                self._location_names, v_info.get('us_entry_points', ['California', 'New York'])
+            )
+
+        # Emergence days in variant order, for day-offset arithmetic against
+        # datetime64[D] date arrays
+        self._emergence_d = np.array(
+            [v_info['emergence_date'] for v_info in self.variants.values()], dtype='datetime64[D]'
+        )
+
+        # Wastewater wave weight of each variant per location: how strongly and
+        # how early a location sees each wave, scaled by transmissibility. This
+        # depends only on the registries, so it is built once for all locations
+        n_locations = len(self._location_names)
+        is_international = np.arange(n_locations) >= self._n_states
+        location_idx = np.arange(n_locations)
+        delay_factor = np.zeros((n_locations, len(self.variants)), dtype=np.float32)
+        for v, v_info in enumerate(self.variants.values()):
+            # Location-specific delay based on origin. International locations:
+            # origin country sees it first, others by connectivity
+            intl_delay = np.where(location_idx == v_info['_origin_idx'], 1.0, self._connectivity * 0.7)
+
+            if v_info.get('international_origin'):
+                # International variant - entry points see it early, other US
+                # states based on connectivity to entry points
+                us_delay = np.where(v_info['_entry_mask'], 0.9, self._connectivity * 0.6)
+            else:
+                # Domestic US origin - delay based on distance from origin state
+                origin_state = v_info['_origin_state_idx']
+                if 0 <= origin_state < self._n_states:
+                    lat_delay = np.maximum(0, 1 - self._lat_dist[origin_state] / 30)
+                else:
+                    lat_delay = np.ones(n_locations)
+                us_delay = np.where(location_idx == origin_state, 1.0, lat_delay)
+
+            delay_factor[:, v] = np.where(is_international, intl_delay, us_delay)
+
+        transmissibility = np.array(
+            [v_info['transmissibility'] for v_info in self.variants.values()], dtype=np.float32
+        )
+        self._wave_weights = delay_factor * (transmissibility * 0.3)
+
+    def _active_locations(self, include_international: bool) -> np.ndarray:
+        """
+        Names of the locations a generator run covers, in location-array order.
+
+        US states lead the location arrays, so the US-only set is a prefix
+        (a view, not a copy).
+        """
+        return self._location_names if include_international else self._location_names[:self._n_states]
+
     def generate_wastewater_data(
         self,
         start_date: str = '2023-01-01',
@@ -299,104 +478,83 @@ class RealisticEpiSimulator:
         print("Generating realistic wastewater data...")
 
         dates = pd.date_range(start=start_date, end=end_date, freq='W')  # Weekly
-        records = []
-
-        # Combine US states and international locations
-        all_locations = dict(self.states)
-        if include_international:
-            all_locations.update(self.international_locations)
 
-        for location, info in all_locations.items():
-            is_international = location in self.international_locations
-
-            # Base viral load varies by population density proxy
-            base_load = 5000 * (info['pop'] / 10) ** 0.5
-
-            for date in dates:
-                # Seasonal component (higher in winter)
-                day_of_year = date.dayofyear
-                # Northern hemisphere vs Southern hemisphere seasonality
-                if info.get('lat', 40) < 0:  # Southern hemisphere
-                    seasonal = 1 + 0.4 * np.cos(2 * np.pi * (day_of_year - 196) / 365)  # Peak in July
-                else:
-                    seasonal = 1 + 0.4 * np.cos(2 * np.pi * (day_of_year - 15) / 365)
-
-                # Variant wave contributions
-                wave_contribution = 0
-                for variant, v_info in self.variants.items():
-                    emergence = pd.Timestamp(v_info['emergence_date'])
-                    peak = pd.Timestamp(v_info['peak_date'])
-
-                    if date >= emergence:
-                        # Time since emergence
-                        days_since = (date - emergence).days
-
-                        # Logistic growth to peak, then decline
-                        peak_days = (peak - emergence).days
-                        if days_since <= peak_days:
-                            # Growth phase
-                            growth = 1 / (1 + np.exp(-0.05 * (days_since - peak_days/2)))
-                        else:
-                            # Decline phase
-                            decline_days = days_since - peak_days
-                            growth = np.exp(-0.02 * decline_days)
-
-                        # Location-specific delay based on origin
-                        origin_country = v_info['origin']
-                        origin_state = v_info.get('origin_state')
-
-                        if is_international:
-                            # International location - check if it's the origin
-                            if location == origin_country:
-                                delay_factor = 1.0  # Origin country sees it first
-                            else:
-                                # Spread based on connectivity
-                                delay_factor = info['connectivity'] * 0.7
-                        else:
-                            # US state
-                            if v_info.get('international_origin'):
-                                # International variant - spread through entry points
-                                us_entry_points = v_info.get('us_entry_points', ['California', 'New York'])
-                                if location in us_entry_points:
-                                    delay_factor = 0.9  # Entry points see it early
-                                else:
-                                    # Other US states - based on connectivity to entry points
-                                    delay_factor = info['connectivity'] * 0.6
-                            else:
-                                # Domestic US origin
-                                if location == origin_state:
-                                    delay_factor = 1.0
-                                else:
-                                    # Delay based on distance from origin state
-                                    origin_info = self.states.get(origin_state, info)
-                                    lat_diff = abs(info['lat'] - origin_info['lat'])
-                                    delay_factor = max(0, 1 - lat_diff / 30)
-
-                        wave_contribution += growth * v_info['transmissibility'] * delay_factor * 0.3
-
-                # Combine components
-                viral_load = base_load * seasonal * (1 + wave_contribution)
-
-                # Add noise (international data may be noisier due to reporting differences)
-                noise_factor = 0.20 if is_international else 0.15
-                viral_load *= np.random.lognormal(0, noise_factor)
-
-                records.append({
-                    'location_id': location,
-                    'date': date,
-                    'viral_load': viral_load,
-                    'wave_contribution': wave_contribution,
-                    'population': info['pop'] * 1e6,
-                    'is_international': is_international
-                })
-
-        df = pd.DataFrame(records)
+        # US states, plus international locations when included
+        locations = self._active_locations(include_international)
+        n_loc, n_weeks = len(locations), len(dates)
+        is_international = np.arange(n_loc) >= self._n_states
+        pop = self._pop[:n_loc]
+        lat = self._lat[:n_loc]
+
+        # All load arithmetic runs in float32: the reported values carry far less
+        # precision than that, and it halves the memory traffic of each pass
+
+        # Base viral load varies by population density proxy
+        base_load = (5000 * (pop / 10) ** 0.5).astype(np.float32)
+
+        # Seasonal component (higher in winter): one curve per hemisphere from a
+        # single cos call, northern peaking mid-January and southern in July,
+        # then gathered per location
+        day_of_year = dates.dayofyear.to_numpy().astype(np.float32)
+        peak_day = np.array([[15], [196]], dtype=np.float32)
+        seasonal_by_hemisphere = 1 + 0.4 * np.cos(2 * np.pi * (day_of_year - peak_day) / 365)
+        seasonal = seasonal_by_hemisphere[(lat < 0).astype(np.intp)]
+
+        # Variant wave contributions, built as growth[variant, week] (shared by
+        # all locations) against the precomputed wave weights[location, variant]
+
+        # Days since each variant's emergence, for all weeks at once
+        date_d = dates.to_numpy().astype('datetime64[D]')
+        days_since = (date_d - self._emergence_d[:, None]).astype(np.float32)
+
+        # Logistic growth to peak, then decline; nothing before emergence
+        peak_days = np.array([v_info['_peak_days'] for v_info in self.variants.values()], dtype=np.float32)[:, None]
+        growth = np.where(
+            days_since < 0,
+            np.float32(0),
+            np.where(
+                days_since <= peak_days,
+                expit(0.05 * (days_since - peak_days / 2)),  # Growth phase
+                np.exp(-0.02 * (days_since - peak_days)),  # Decline phase
+            ),
+        )
+
+        # Sum over variants as one (location x variant) @ (variant x week) product;
+        # the result is then reused in place as the viral load buffer
+        viral_load = self._wave_weights[:n_loc] @ growth
+
+        # Combine components
+        viral_load += 1
+        viral_load *= base_load[:, None] * seasonal
+
+        # Add noise (international data may be noisier due to reporting differences)
+        # (lognormal as exp of scaled float32 standard normals)
+        noise_factor = np.where(is_international, 0.20, 0.15).astype(np.float32)
+        noise = self._wastewater_rng.standard_normal(viral_load.shape, dtype=np.float32)
+        noise *= noise_factor[:, None]
+        viral_load *= np.exp(noise, out=noise)
 
         # Calculate ACTUAL week-over-week change from the viral load data
-        df = df.sort_values(['location_id', 'date'])
-        df['prev_load'] = df.groupby('location_id')['viral_load'].shift(1)
-        df['pct_change_weekly'] = ((df['viral_load'] - df['prev_load']) / df['prev_load'] * 100).fillna(0)
-        df = df.drop(columns=['prev_load', 'wave_contribution'])
+        # (each row is one location's consecutive weeks; the first week has none),
+        # written straight into the output matrix
+        pct_change_weekly = np.zeros_like(viral_load)
+        weekly = pct_change_weekly[:, 1:]
+        np.subtract(viral_load[:, 1:], viral_load[:, :-1], out=weekly)
+        np.divide(weekly, viral_load[:, :-1], out=weekly)
+        weekly *= 100
+
+        # Emit locations in name order, each as a contiguous run of weeks
+        order = np.argsort(locations, kind='stable')
+        df = pd.DataFrame({
+            'location_id': pd.Categorical.from_codes(
+                np.repeat(np.arange(n_loc), n_weeks), categories=locations[order]
+            ),
+            'date': np.tile(dates, n_loc),
+            'viral_load': viral_load[order].ravel(),
+            'population': np.repeat((pop[order] * 1e6).astype(np.float32), n_weeks),
+            'is_international': np.repeat(is_international[order], n_weeks),
+            'pct_change_weekly': pct_change_weekly[order].ravel(),
+        })
 
         us_count = len(df[~df['is_international']])
         intl_count = len(df[df['is_international']])
@@ -426,140 +584,69 @@ class RealisticEpiSimulator:
         print("Generating realistic variant data...")
 
         dates = pd.date_range(start=start_date, end=end_date, freq='D')
-        records = []
-
-        for variant, v_info in self.variants.items():
-            emergence = pd.Timestamp(v_info['emergence_date'])
-            is_international_origin = v_info.get('international_origin', False)
-            origin_country = v_info['origin']
-            origin_state = v_info.get('origin_state')
-
-            if emergence < pd.Timestamp(start_date):
-                emergence = pd.Timestamp(start_date)
-
-            # Generate data for international locations first (if international origin)
-            if include_international and is_international_origin:
-                for country, c_info in self.international_locations.items():
-                    if country == origin_country:
-                        arrival_date = emergence
-                    else:
-                        # International spread based on connectivity
-                        connectivity = c_info['connectivity']
-                        base_delay = 14  # Slower international spread
-                        delay = int(base_delay / connectivity)
-                        delay = max(5, int(delay * np.random.uniform(0.7, 1.3)))
-                        arrival_date = emergence + timedelta(days=delay)
-
-                    if arrival_date > pd.Timestamp(end_date):
-                        continue
-
-                    for date in dates:
-                        if date < arrival_date:
-                            continue
-
-                        days_since_arrival = (date - arrival_date).days
-
-                        # Growth curve (logistic)
-                        carrying_capacity = max(c_info['pop'] * 30, 100)
-                        growth_rate = v_info['spread_rate']
-                        prevalence = carrying_capacity / (1 + np.exp(-growth_rate * (days_since_arrival - 60)))
-
-                        # Sequencing capacity affects detection
-                        seq_capacity = c_info.get('sequencing_capacity', 0.5)
-                        base_sample_rate = 0.008
-                        sample_rate = base_sample_rate * seq_capacity * (0.5 + c_info['connectivity'])
-
-                        expected_sequences = prevalence * sample_rate
-
-                        if expected_sequences > 0.05:
-                            sequences = np.random.poisson(max(1, expected_sequences))
-                            if sequences > 0:
-                                records.append({
-                                    'location': country,
-                                    'date': date,
-                                    'variant': variant,
-                                    'sequence_count': sequences,
-                                    'is_international': True
-                                })
-
-            # Calculate arrival time for US states
-            us_entry_points = v_info.get('us_entry_points', ['California', 'New York'])
-
-            for state, s_info in self.states.items():
-                if is_international_origin:
-                    # International variant - arrives through entry points
-                    if state in us_entry_points:
-                        # Entry points get it after international spread
-                        # Calculate delay based on international flight volume
-                        intl_routes_to_state = sum(
-                            pax for (orig, dest), pax in self.international_routes.items()
-                            if dest == state and orig == origin_country
-                        )
-                        if intl_routes_to_state > 5000:
-                            delay = 7  # High traffic = fast arrival
-                        elif intl_routes_to_state > 2000:
-                            delay = 14
-                        else:
-                            delay = 21
-
-                        delay = max(5, int(delay * np.random.uniform(0.8, 1.2)))
-                        arrival_date = emergence + timedelta(days=delay)
-                    else:
-                        # Non-entry points get it after domestic spread from entry points
-                        connectivity = s_info['connectivity']
-                        base_delay = 21 + (1 - connectivity) * 30  # 21-51 days
-                        delay = max(14, int(base_delay * np.random.uniform(0.7, 1.3)))
-                        arrival_date = emergence + timedelta(days=delay)
-                else:
-                    # Domestic US origin
-                    if state == origin_state:
-                        arrival_date = emergence
-                    else:
-                        connectivity = s_info['connectivity']
-                        lat_distance = abs(s_info['lat'] - self.states[origin_state]['lat'])
-                        base_delay = 7 + lat_distance / 2
-                        delay = int(base_delay / connectivity)
-                        delay = max(3, int(delay * np.random.uniform(0.7, 1.3)))
-                        arrival_date = emergence + timedelta(days=delay)
-
-                if arrival_date > pd.Timestamp(end_date):
-                    continue
-
-                # Generate sequence counts over time
-                for date in dates:
-                    if date < arrival_date:
-                        continue
-
-                    days_since_arrival = (date - arrival_date).days
-
-                    # Growth curve (logistic)
-                    carrying_capacity = max(s_info['pop'] * 50, 100)
-                    growth_rate = v_info['spread_rate']
-                    prevalence = carrying_capacity / (1 + np.exp(-growth_rate * (days_since_arrival - 60)))
-
-                    # Sampling probability - higher for hub states
-                    base_sample_rate = 0.01
-                    sample_rate = base_sample_rate * (0.5 + s_info['connectivity'])
-
-                    expected_sequences = prevalence * sample_rate
-
-                    if expected_sequences > 0.05:
-                        sequences = np.random.poisson(max(1, expected_sequences))
-                        if sequences > 0:
-                            records.append({
-                                'location': state,
-                                'date': date,
-                                'variant': variant,
-                                'sequence_count': sequences,
-                                'is_international': False
-                            })
-
-        df = pd.DataFrame(records)
-
-        # Aggregate to weekly for cleaner data
-        df['week'] = df['date'].dt.to_period('W').dt.start_time
-        df = df.groupby(['location', 'week', 'variant', 'is_international'])['sequence_count'].sum().reset_index()
-        df = df.rename(columns={'week': 'date'})
+        n_days = len(dates)
+
+        # Arrival-delay jitter for every (variant, location), drawn in one call as
+        # U[0, 1) and scaled to each spread path's range
+        variant_names = list(self.variants)
+        location_names = list(self._location_names)
+        jitter = self._variant_rng.random((len(variant_names), len(location_names)))
+
+        # Emergence as integer day indices from start; variants that emerged
+        # earlier start on day 0
+        start_d = dates[0].to_datetime64().astype('datetime64[D]')
+        emergence_days = np.maximum(0, (self._emergence_d - start_d).astype(np.int64))
+
+        # Variants spread independently, so they are simulated concurrently; each
+        # samples from its own child stream, keeping results
+        # independent of scheduling
+        streams = self._variant_rng.spawn(len(variant_names))
+        with ThreadPoolExecutor(max_workers=min(len(variant_names), os.cpu_count() or 1)) as pool:
+            spreads = list(pool.map(
+                lambda v, v_info: self._simulate_variant_spread(
+                    v_info, emergence_days[v], n_days, jitter[v], include_international, streams[v]
+                ),
+                range(len(variant_names)), self.variants.values()
+            ))
+
+        row_location = np.concatenate([locations for locations, _, _ in spreads])
+        row_day = np.concatenate([days for _, days, _ in spreads])
+        row_variant = np.repeat(np.arange(len(variant_names)), [len(days) for _, days, _ in spreads])
+        row_count = np.concatenate([sequences for _, _, sequences in spreads])
+
+        # Aggregate to weekly for cleaner data: sum the counts straight into a
+        # (location, week, variant) table, with Monday-start weeks and the axes
+        # ordered by name, then keep the non-empty cells. Locations are the
+        # run's active set (arrivals only ever reach it), matching the
+        # wastewater and flight frames' categories
+        active_names = list(self._active_locations(include_international))
+        location_categories, location_rank = _sorted_names(active_names)
+        variant_categories, variant_rank = _sorted_names(variant_names)
+
+        # Integer Monday-start week keys on the epoch day count (1970-01-01 was a
+        # Thursday), offset so the first week of the range is 0
+        start_day = start_d.astype(np.int64)
+        first_week = (start_day + 3) // 7
+        n_weeks = (start_day + n_days - 1 + 3) // 7 - first_week + 1
+        week_starts = ((first_week + np.arange(n_weeks)) * 7 - 3).astype('datetime64[D]').astype('datetime64[ns]')
+
+        row_week = (start_day + row_day + 3) // 7 - first_week
+        cell = (location_rank[row_location] * n_weeks + row_week) * len(variant_names) + variant_rank[row_variant]
+        weekly_counts = np.bincount(
+            cell, weights=row_count, minlength=len(active_names) * n_weeks * len(variant_names)
+        )
+        cells = np.flatnonzero(weekly_counts)
+        location_code, week, variant_code = np.unravel_index(cells, (len(active_names), n_weeks, len(variant_names)))
+
+        # location and variant are categoricals with name-sorted categories, so the
+        # codes are small ints and sorting/grouping by them stays alphabetical
+        df = pd.DataFrame({
+            'location': pd.Categorical.from_codes(location_code, categories=location_categories),
+            'date': week_starts[week],
+            'variant': pd.Categorical.from_codes(variant_code, categories=variant_categories),
+            'is_international': np.isin(location_categories, list(self.international_locations))[location_code],
+            'sequence_count': weekly_counts[cells].astype(np.int64),
+        })
 
         us_locs = df[~df['is_international']]['location'].nunique()
         intl_locs = df[df['is_international']]['location'].nunique() if include_international else 0
@@ -572,6 +659,170 @@ class RealisticEpiSimulator:
 
         return df
 
+    def _simulate_variant_spread(
+        self,
+        v_info: dict,
+        emergence_day: int,
+        n_days: int,
+        jitter: np.ndarray,
+        include_international: bool,
+        rng: np.random.Generator
+    ) -> tuple:
+        """
+        Simulate one variant's arrival and daily sequencing across all locations.
+
+        Timing is tracked as integer day indices from the start date. jitter
+        holds this variant's U[0, 1) delay draw per location. Returns the
+        location indices, day indices and counts of non-zero draws.
+        """
+        is_international_origin = v_info.get('international_origin', False)
+        origin = v_info['_origin_idx']
+        origin_state = v_info['_origin_state_idx']
+
+        # Arrival delays are computed for all locations of a spread path at
+        # once as integer day offsets (truncated like int())
+        states = np.arange(self._n_states)
+        connectivity = self._connectivity
+
+        if is_international_origin:
+            # International variant - arrives through entry points. Entry points
+            # get it after international spread, faster with more flight volume
+            route_volume = self._intl_route_volume[origin, states] if origin >= 0 else np.zeros(len(states))
+            entry_delay = np.select([route_volume > 5000, route_volume > 2000], [7, 14], 21)
+            entry_delay = np.maximum(5, (entry_delay * (0.8 + 0.4 * jitter[states])).astype(int))
+
+            # Non-entry points get it after domestic spread from entry points (21-51 days)
+            base_delay = 21 + (1 - connectivity[states]) * 30
+            domestic_delay = np.maximum(14, (base_delay * (0.7 + 0.6 * jitter[states])).astype(int))
+
+            state_delay = np.where(v_info['_entry_mask'][states], entry_delay, domestic_delay)
+        else:
+            # Domestic US origin - delay grows with distance from the origin state
+            base_delay = 7 + self._lat_dist[origin_state, states] / 2
+            delay = (base_delay / connectivity[states]).astype(int)
+            state_delay = np.where(
+                states == origin_state, 0, np.maximum(3, (delay * (0.7 + 0.6 * jitter[states])).astype(int))
+            )
+
+        if include_international and is_international_origin:
+            # International locations see it first: origin country on emergence,
+            # others by connectivity (slower international spread)
+            countries = np.arange(self._n_states, len(self._location_names))
+            delay = (14 / connectivity[countries]).astype(int)
+            country_delay = np.where(
+                countries == origin,
+                0,
+                np.maximum(5, (delay * (0.7 + 0.6 * jitter[countries])).astype(int)),
+            )
+            arrival_locations = np.concatenate([countries, states])
+            arrival_days = emergence_day + np.concatenate([country_delay, state_delay])
+        else:
+            arrival_locations = states
+            arrival_days = emergence_day + state_delay
+
+        # Locations arriving after the last day would draw nothing
+        in_range = arrival_days < n_days
+        arrival_locations, arrival_days = arrival_locations[in_range], arrival_days[in_range]
+
+        # Generate sequence counts over time for every location at once, using
+        # the precomputed per-location growth and sampling terms
+        location_pos, days, sequences = _sample_sequences(
+            arrival_days, n_days,
+            self._carrying_capacity[arrival_locations], v_info['spread_rate'],
+            self._sample_rate[arrival_locations], rng
+        )
+        return arrival_locations[location_pos], days, sequences
+
+    def _flight_batches(
+        self,
+        start_date: str,
+        end_date: str,
+        include_international: bool,
+        days_per_batch: Optional[int] = None
+    ):
+        """
+        Yield flight columns for consecutive blocks of days_per_batch dates.
+
+        All dates come in a single block by default. Blocks consume the flight
+        RNG stream in date order, so the records are the same however the
+        range is split.
+        """
+        dates = pd.date_range(start=start_date, end=end_date, freq='D')
+        day_of_year = dates.dayofyear.to_numpy()
+        month, day = dates.month.to_numpy(), dates.day.to_numpy()
+
+        # Holiday and summer masks over the date range
+        december_holidays = (month == 12) & (day >= 20)
+        thanksgiving_week = (month == 11) & (day >= 22) & (day <= 28)
+        summer = (month >= 6) & (month <= 8)
+
+        # Domestic US flights: every ordered pair of distinct states, origin-major
+        n_states = self._n_states
+        origin_idx, dest_idx = np.nonzero(~np.eye(n_states, dtype=bool))
+
+        # Passenger estimate based on hub connectivity and population (gravity model)
+        pop, connectivity = self._pop[:n_states], self._connectivity[:n_states]
+        base_flow = (pop[origin_idx] * pop[dest_idx]) ** 0.5 * 100
+        connectivity_factor = (connectivity[origin_idx] + connectivity[dest_idx]) / 2
+
+        # Seasonal travel factor (higher in summer, holidays)
+        seasonal = 1 + 0.2 * np.sin(2 * np.pi * (day_of_year - 180) / 365)
+        seasonal[december_holidays] *= 1.5
+        seasonal[thanksgiving_week] *= 1.4
+
+        # International flights to US
+        routes = list(self.international_routes.items()) if include_international else []
+        route_origin = np.array([self._location_index[origin] for (origin, _), _ in routes], dtype=np.intp)
+        route_dest = np.array([self._location_index[dest] for (_, dest), _ in routes], dtype=np.intp)
+        base_passengers = np.array([volume for _, volume in routes], dtype=float)
+
+        # International travel has different seasonal patterns
+        intl_seasonal = 1 + 0.15 * np.sin(2 * np.pi * (day_of_year - 180) / 365)
+        intl_seasonal[december_holidays] *= 1.3
+        intl_seasonal[summer] *= 1.2  # Summer peak
+
+        # Per-route noise bounds, domestic routes first within each date
+        n_domestic, n_intl = len(origin_idx), len(routes)
+        n_routes = n_domestic + n_intl
+        noise_low = np.repeat([0.8, 0.85], [n_domestic, n_intl])
+        noise_high = np.repeat([1.2, 1.15], [n_domestic, n_intl])
+        domestic_flow = base_flow * connectivity_factor
+
+        # Origin/destination as categoricals over the name-sorted locations
+        location_categories, location_rank = _sorted_names(list(self._active_locations(include_international)))
+        # Smallest signed dtype holding codes 0..n-1; widens past 128 locations
+        location_rank = location_rank.astype(np.min_scalar_type(-len(location_categories)))
+        route_origin_code = location_rank[np.concatenate([origin_idx, route_origin])]
+        route_dest_code = location_rank[np.concatenate([dest_idx, route_dest])]
+        route_is_international = np.arange(n_routes) >= n_domestic
+
+        date_values = dates.to_numpy()
+        step = days_per_batch or max(len(dates), 1)
+        for lo in range(0, len(dates), step):
+            block = slice(lo, lo + step)
+            n_days = len(date_values[block])
+
+            # Daily noise for every (date, route) in the block, drawn in one call
+            noise = self._flight_rng.uniform(noise_low, noise_high, size=(n_days, n_routes))
+
+            # Scale the noise table in place into passenger counts, truncating
+            # like int() at each step and then flooring at the route minimum
+            passengers = noise
+            passengers[:, :n_domestic] *= np.trunc(np.multiply.outer(seasonal[block], domestic_flow))
+            passengers[:, n_domestic:] *= np.trunc(np.multiply.outer(intl_seasonal[block], base_passengers))
+            np.trunc(passengers, out=passengers)
+            np.maximum(passengers[:, :n_domestic], 50, out=passengers[:, :n_domestic])
+            np.maximum(passengers[:, n_domestic:], 100, out=passengers[:, n_domestic:])
+
+            # Lay out in date order, domestic routes before international ones
+            yield {
+                'origin': pd.Categorical.from_codes(np.tile(route_origin_code, n_days), categories=location_categories),
+                'destination': pd.Categorical.from_codes(np.tile(route_dest_code, n_days), categories=location_categories),
+                'date': np.repeat(date_values[block], n_routes),
+                'passengers': passengers.astype(np.int32).ravel(),
+                'is_international': np.tile(route_is_international, n_days),
+            }
+
     def generate_flight_data(
         self,
         start_date: str = '2023-01-01',
@@ -589,92 +840,77 @@ class RealisticEpiSimulator:
         """
         print("Generating realistic flight data...")
 
-        dates = pd.date_range(start=start_date, end=end_date, freq='D')
-        records = []
-
-        states = list(self.states.keys())
-
-        for date in dates:
-            # Seasonal travel factor (higher in summer, holidays)
-            day_of_year = date.dayofyear
-            seasonal = 1 + 0.2 * np.sin(2 * np.pi * (day_of_year - 180) / 365)
-
-            # Holiday boost
-            if date.month == 12 and date.day >= 20:
-                seasonal *= 1.5
-            elif date.month == 11 and 22 <= date.day <= 28:
-                seasonal *= 1.4
-
-            # Domestic US flights
-            for origin in states:
-                for dest in states:
-                    if origin == dest:
-                        continue
-
-                    # Passenger estimate based on hub connectivity and population
-                    o_info = self.states[origin]
-                    d_info = self.states[dest]
-
-                    # Gravity model
-                    base_flow = (o_info['pop'] * d_info['pop']) ** 0.5 * 100
-                    connectivity_factor = (o_info['connectivity'] + d_info['connectivity']) / 2
-
-                    passengers = int(base_flow * connectivity_factor * seasonal)
-
-                    # Add daily noise
-                    passengers = max(50, int(passengers * np.random.uniform(0.8, 1.2)))
-
-                    records.append({
-                        'origin': origin,
-                        'destination': dest,
-                        'date': date,
-                        'passengers': passengers,
-                        'is_international': False
-                    })
-
-            # International flights to US
-            if include_international:
-                for (origin_country, dest_state), base_passengers in self.international_routes.items():
-                    # Apply seasonal factor with some variation
-                    # International travel has different seasonal patterns
-                    intl_seasonal = 1 + 0.15 * np.sin(2 * np.pi * (day_of_year - 180) / 365)
-
-                    # Holiday boost for international
-                    if date.month == 12 and date.day >= 20:
-                        intl_seasonal *= 1.3
-                    elif date.month in [6, 7, 8]:  # Summer peak
-                        intl_seasonal *= 1.2
-
-                    passengers = int(base_passengers * intl_seasonal)
-                    passengers = max(100, int(passengers * np.random.uniform(0.85, 1.15)))
-
-                    records.append({
-                        'origin': origin_country,
-                        'destination': dest_state,
-                        'date': date,
-                        'passengers': passengers,
-                        'is_international': True
-                    })
-
-        df = pd.DataFrame(records)
-
-        domestic_routes = df[~df['is_international']].groupby(['origin', 'destination']).ngroups
-        intl_routes = df[df['is_international']].groupby(['origin', 'destination']).ngroups if include_international else 0
+        # One block covering every date; the frame takes over its arrays
+        # without copying them
+        columns, = self._flight_batches(start_date, end_date, include_international)
+        df = pd.DataFrame(columns, copy=False)
 
+        n_domestic = self._n_states * (self._n_states - 1)
         print(f"  Generated {len(df)} flight records")
-        print(f"  Domestic routes: {domestic_routes}")
+        print(f"  Domestic routes: {n_domestic}")
         if include_international:
-            print(f"  International routes: {intl_routes}")
+            print(f"  International routes: {len(self.international_routes)}")
 
         return df
 
+    def write_flight_data(
+        self,
+        path: str,
+        start_date: str = '2023-01-01',
+        end_date: str = '2024-06-30',
+        include_international: bool = True,
+        days_per_batch: int = 7
+    ) -> str:
+        """
+        Stream flight data to a zstd Parquet file, days_per_batch dates at a time.
+
+        Only one block of records is held in memory, so long ranges can be
+        written without building the full frame; pd.read_parquet(path) gives
+        back the same frame as generate_flight_data.
+        """
+        writer = None
+        try:
+            for columns in self._flight_batches(start_date, end_date, include_international, days_per_batch):
+                batch = pa.RecordBatch.from_pandas(pd.DataFrame(columns, copy=False), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, batch.schema, compression='zstd')
+                writer.write_batch(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
+
+    def _dataset_cache_paths(
+        self,
+        cache_dir: str,
+        start_date: str,
+        end_date: str,
+        include_international: bool
+    ) -> dict:
+        """Parquet paths for the cached datasets of one (seed, period, coverage) run."""
+        key = hashlib.blake2b(
+            f"{self.seed}|{start_date}|{end_date}|{include_international}|{_source_digest()}".encode(),
+            digest_size=6,
+        ).hexdigest()
+        return {
+            name: os.path.join(cache_dir, f"{name}_{key}.parquet")
+            for name in ('wastewater', 'variants', 'flights')
+        }
+
     def generate_all(
         self,
         start_date: str = '2023-01-01',
         end_date: str = '2024-06-30',
-        include_international: bool = True
+        include_international: bool = True,
+        cache_dir: Optional[str] = None
     ) -> tuple:
-        """Generate all datasets with optional international coverage."""
+        """
+        Generate all datasets with optional international coverage.
+
+        With cache_dir set, the datasets are memoized there as zstd Parquet,
+        keyed on the seed, period, coverage and this module's source, so a
+        repeat run reads them back instead of regenerating.
+        """
         print("=" * 60)
         print("GENERATING REALISTIC EPIDEMIOLOGICAL DATA")
         print("=" * 60)
@@ -688,14 +924,28 @@ class RealisticEpiSimulator:
             print(f"International origin variants: {intl_variants}")
         print()
 
+        # Create location mapping (identity for both US states and international)
+        location_mapping = {name: name for name in self._active_locations(include_international)}
+
+        paths = None
+        if cache_dir is not None:
+            paths = self._dataset_cache_paths(cache_dir, start_date, end_date, include_international)
+            if all(os.path.exists(path) for path in paths.values()):
+                print(f"Loading cached datasets from {cache_dir}")
+                wastewater, variants, flights = (pd.read_parquet(path) for path in paths.values())
+                return wastewater, variants, flights, location_mapping
+
         wastewater = self.generate_wastewater_data(start_date, end_date, include_international)
         variants = self.generate_variant_data(start_date, end_date, include_international)
         flights = self.generate_flight_data(start_date, end_date, include_international)
 
-        # Create location mapping (identity for both US states and international)
-        location_mapping = {s: s for s in self.states.keys()}
-        if include_international:
-            location_mapping.update({c: c for c in self.international_locations.keys()})
+        if paths is not None:
+            # Write each file under a temporary name first so an interrupted run
+            # never leaves a truncated dataset behind
+            os.makedirs(cache_dir, exist_ok=True)
+            for df, path in zip((wastewater, variants, flights), paths.values()):
+                df.to_parquet(f"{path}.tmp", compression='zstd', index=False)
+                os.replace(f"{path}.tmp", path)
 
         return wastewater, variants, flights, location_mapping
 
@@ -709,7 +959,8 @@ def run_validation_with_realistic_data(include_international: bool = True):
     wastewater_df, variant_df, flight_df, location_mapping = simulator.generate_all(
         start_date='2023-01-01',
         end_date='2024-06-30',
-        include_international=include_international
+        include_international=include_international,
+        cache_dir=os.path.join('data', 'cache', 'simulation')
     )
 
     print("\n" + "=" * 60)
@@ -808,7 +1059,7 @@ def run_validation_with_realistic_data(include_international: bool = True):
         print("\n[INTL-2] International flight volume to US entry points:")
         intl_flights = flight_df[flight_df['is_international'] == True]
         if not intl_flights.empty:
-            top_routes = intl_flights.groupby(['origin', 'destination'])['passengers'].sum()
+            top_routes = intl_flights.groupby(['origin', 'destination'], observed=True)['passengers'].sum()
             top_routes = top_routes.sort_values(ascending=False).head(10)
             for (orig, dest), pax in top_routes.items():
                 print(f"     {orig} → {dest}: {pax:,.0f} passengers")
@@ -844,8 +1095,16 @@ def run_validation_with_realistic_data(include_international: bool = True):
 
     # Save report
     report_file = 'validation_report_international.json' if include_international else 'validation_report_realistic.json'
-    with open(report_file, 'w') as f:
-        json.dump(report, f, indent=2, default=str)
+    # orjson encodes NumPy scalars and datetimes natively; the stdlib encoder
+    # only handles what it rejects (e.g. non-string keys)
+    try:
+        data = orjson.dumps(
+            report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=str
+        )
+    except orjson.JSONEncodeError:
+        data = json.dumps(report, indent=2, default=str).encode()
+    with open(report_file, 'wb') as f:
+        f.write(data)
     print(f"\nFull report saved to: {report_file}")
 
     return report
@@ -176,7 +176,7 @@ class RetrospectiveValidator:
         for variant in variants_to_test:
             # Get first detection per location
             variant_data = self.variants[self.variants['variant'] == variant]
-            first_detections = variant_data.groupby('location')['date'].min().reset_index()
+            first_detections = variant_data.groupby('location', observed=True)['date'].min().reset_index()
             first_detections.columns = ['location', 'first_detection']
 
             if len(first_detections) < min_locations:
@@ -548,7 +548,7 @@ class RetrospectiveValidator:
         Success: Median lead time > 7 days
         """
         variant_data = self.variants[self.variants['variant'] == variant]
-        first_detections = variant_data.groupby('location')['date'].min().to_dict()
+        first_detections = variant_data.groupby('location', observed=True)['date'].min().to_dict()
 
         lead_times = []
 
@@ -702,76 +702,73 @@ def generate_synthetic_data(n_locations: int = 50, n_days: int = 365):
     np.random.seed(42)
 
     locations = [f"LOC_{i:03d}" for i in range(n_locations)]
+    location_arr = np.asarray(locations)
     dates = pd.date_range(start='2023-01-01', periods=n_days, freq='D')
 
-    # Wastewater data
-    wastewater_records = []
-    for loc in locations:
-        base_load = np.random.uniform(1000, 10000)
-        trend = np.random.uniform(-0.001, 0.003)
-
-        for i, date in enumerate(dates):
-            noise = np.random.normal(0, 0.1)
-            seasonal = np.sin(2 * np.pi * i / 365) * 0.2
-            load = base_load * (1 + trend * i + seasonal + noise)
-
-            wastewater_records.append({
-                'location_id': loc,
-                'date': date,
-                'viral_load': max(load, 100),
-                'pct_change_weekly': np.random.uniform(-20, 30)
-            })
-
-    wastewater_df = pd.DataFrame(wastewater_records)
+    # Wastewater data: every random draw is made as one array per quantity
+    # rather than one scalar call per (location, day)
+    day = np.arange(n_days)
+    base_load = np.random.uniform(1000, 10000, size=n_locations)
+    trend = np.random.uniform(-0.001, 0.003, size=n_locations)
+    noise = np.random.normal(0, 0.1, size=(n_locations, n_days))
+    seasonal = np.sin(2 * np.pi * day / 365) * 0.2
+    load = base_load[:, None] * (1 + trend[:, None] * day + seasonal + noise)
+
+    wastewater_df = pd.DataFrame({
+        'location_id': np.repeat(locations, n_days),
+        'date': np.tile(dates, n_locations),
+        'viral_load': np.maximum(load, 100).ravel(),
+        'pct_change_weekly': np.random.uniform(-20, 30, size=n_locations * n_days)
+    })
 
     # Variant data
     variants = ['JN.1', 'BA.2.86', 'XBB.1.5', 'EG.5']
-    variant_records = []
+    variant_frames = []
 
     for variant in variants:
         # Each variant starts spreading from a few seed locations
         seed_locations = np.random.choice(locations, size=3, replace=False)
-        seed_date = dates[np.random.randint(30, 200)]
+        seed_day = np.random.randint(30, 200)
 
-        # Spread to other locations over time
-        for loc in locations:
-            if loc in seed_locations:
-                first_date = seed_date
-            else:
-                # Delay based on "distance" (random for synthetic)
-                delay = np.random.randint(7, 90)
-                first_date = seed_date + timedelta(days=delay)
-
-            if first_date < dates[-1]:
-                # Generate sequence counts
-                for date in dates[dates >= first_date]:
-                    days_since = (date - first_date).days
-                    count = int(np.random.poisson(max(1, 10 * np.log1p(days_since))))
-                    if count > 0:
-                        variant_records.append({
-                            'location': loc,
-                            'date': date,
-                            'variant': variant,
-                            'sequence_count': count
-                        })
-
-    variant_df = pd.DataFrame(variant_records)
-
-    # Flight data
-    flight_records = []
-    for date in dates:
-        for origin in np.random.choice(locations, size=20, replace=False):
-            for dest in np.random.choice(locations, size=5, replace=False):
-                if origin != dest:
-                    passengers = np.random.randint(50, 500)
-                    flight_records.append({
-                        'origin': origin,
-                        'destination': dest,
-                        'date': date,
-                        'passengers': passengers
-                    })
-
-    flight_df = pd.DataFrame(flight_records)
+        # Spread to other locations over time, delay based on "distance"
+        # (random for synthetic)
+        delays = np.where(
+            np.isin(locations, seed_locations), 0, np.random.randint(7, 90, size=n_locations)
+        )
+        first_day = seed_day + delays
+
+        # Generate sequence counts for every (location, day) from first detection
+        days_since = day[None, :] - first_day[:, None]
+        active = (days_since >= 0) & (first_day < n_days - 1)[:, None]
+        loc_idx, day_idx = np.nonzero(active)
+        counts = np.random.poisson(np.maximum(1, 10 * np.log1p(days_since[active])))
+        detected = counts > 0
+        variant_frames.append(pd.DataFrame({
+            'location': location_arr[loc_idx[detected]],
+            'date': dates[day_idx[detected]],
+            'variant': variant,
+            'sequence_count': counts[detected]
+        }))
+
+    variant_df = pd.concat(variant_frames, ignore_index=True)
+
+    # Flight data: 20 origins per day, 5 destinations each, self-loops dropped.
+    # Argsorting a block of uniforms gives a random permutation per row, so the
+    # leading columns are samples without replacement for every row at once.
+    origins = location_arr[np.argsort(np.random.random((n_days, n_locations)), axis=1)[:, :20]]
+    dests = location_arr[
+        np.argsort(np.random.random((n_days, 20, n_locations)), axis=2)[..., :5]
+    ]
+    origin_col = np.broadcast_to(origins[:, :, None], dests.shape)
+    date_col = np.broadcast_to(dates.values[:, None, None], dests.shape)
+    keep = origin_col != dests
+
+    flight_df = pd.DataFrame({
+        'origin': origin_col[keep],
+        'destination': dests[keep],
+        'date': date_col[keep],
+        'passengers': np.random.randint(50, 500, size=int(keep.sum()))
+    })
 
     # Location mapping (identity for synthetic)
     location_mapping = {loc: loc for loc in locations}
@@ -5,19 +5,27 @@ Provides flight route data for visualization and import pressure calculation.
 """
 
 from datetime import datetime, date, timedelta
-from typing import Optional, List
-import hashlib
-import random
+from functools import lru_cache
+from operator import attrgetter
+from typing import Optional, List, Tuple
+import heapq
 import logging
 
+import numpy as np
 from fastapi import APIRouter, Query, HTTPException, Depends
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.responses import model_response
 
-router = APIRouter(prefix="/api/flights", tags=["flights"])
+router = APIRouter(
+    prefix="/api/flights",
+    tags=["flights"],
+    default_response_class=ORJSONResponse,
+)
 
 
 class FlightArc(BaseModel):
@@ -35,6 +43,9 @@ class FlightArc(BaseModel):
     origin_risk: Optional[float] = None
 
 
+_FLIGHT_ARCS = TypeAdapter(List[FlightArc])
+
+
 class FlightArcsResponse(BaseModel):
     arcs: List[FlightArc]
     total: int
@@ -102,77 +113,124 @@ AIRPORT_HUBS = {
     "DOH": {"city": "Doha", "country": "QA", "lat": 25.2731, "lon": 51.6081, "risk": 40},
 }
 
+# Hub attributes as parallel arrays in AIRPORT_HUBS order, for selecting hubs
+# by position; a route between hubs i and j is numbered i * len(hubs) + j
+_HUB_INFO = list(AIRPORT_HUBS.values())
+_HUB_COUNTRIES = np.array([info["country"] for info in _HUB_INFO])
+_HUB_RISKS = np.array([info["risk"] for info in _HUB_INFO], dtype=float)
+_HUB_IS_MAJOR = np.isin(list(AIRPORT_HUBS), ["JFK", "LHR", "DXB", "SIN"])
+
+
+@lru_cache(maxsize=64)
+def _synthetic_routes(target_date: date) -> Tuple[np.ndarray, ...]:
+    """
+    Draw every synthetic route for a date as arrays, before any filtering.
+
+    Returns (origin hub, destination hub, passengers, flights, origin risk),
+    in origin order and then slot order.
+    """
+    n_hubs = len(_HUB_INFO)
+
+    # Use date as seed for consistent results (own generator, so no global
+    # random state)
+    seed = int(target_date.strftime("%Y%m%d"))
+    rng = np.random.default_rng(seed)
+
+    # Each hub connects to 5-10 other hubs: the first num_destinations of a
+    # random ordering of all hubs, with a passenger estimate and risk
+    # variation drawn for each of the (up to 10) slots
+    num_destinations = rng.integers(5, 11, size=n_hubs)
+    destinations = rng.random((n_hubs, n_hubs)).argsort(axis=1)[:, :10]
+    base_pax = rng.integers(200, 2001, size=(n_hubs, 10))
+    risk_variation = rng.uniform(-10, 10, size=(n_hubs, 10))
+
+    origins = np.arange(n_hubs)[:, None]
+    keep = (np.arange(10) < num_destinations[:, None]) & (destinations != origins)
+
+    # Major hub connections get more traffic
+    base_pax = np.where(_HUB_IS_MAJOR[:, None] | _HUB_IS_MAJOR[destinations], base_pax * 2, base_pax)
+
+    dep_idx, slot = np.nonzero(keep)
+    pax = base_pax[dep_idx, slot]
+    flights = np.maximum(1, pax // 180)  # Avg 180 pax per flight
+    origin_risk = np.clip(_HUB_RISKS[dep_idx] + risk_variation[dep_idx, slot], 0, 100)
+    return dep_idx, destinations[dep_idx, slot], pax, flights, origin_risk
+
+
+@lru_cache(maxsize=32)
+def _synthetic_arcs(target_date: date) -> Tuple[FlightArc, ...]:
+    """
+    Every synthetic route for a date as a FlightArc, memoized per date.
+
+    Indexed like the arrays from _synthetic_routes. Only the date is part
+    of the key, so client filter values never add entries (about 330 KB
+    each); the arcs are shared between callers and must not be mutated.
+    """
+    dep_idx, arr_idx, pax, flights, origin_risk = _synthetic_routes(target_date)
+    n_hubs = len(_HUB_INFO)
+    date_ordinal = target_date.toordinal()
+
+    # Validate all arcs in one call rather than one model at a time
+    arcs = []
+    for i, j, pax_estimate, flight_count, risk in zip(
+        dep_idx.tolist(), arr_idx.tolist(), pax.tolist(), flights.tolist(), origin_risk.tolist(),
+    ):
+        dep_info, arr_info = _HUB_INFO[i], _HUB_INFO[j]
+        arcs.append({
+            # Unique per route and date, 12 hex digits
+            "arc_id": f"arc_{i * n_hubs + j:04x}{date_ordinal:08x}",
+            "origin_lat": dep_info["lat"],
+            "origin_lon": dep_info["lon"],
+            "origin_name": dep_info["city"],
+            "origin_country": dep_info["country"],
+            "dest_lat": arr_info["lat"],
+            "dest_lon": arr_info["lon"],
+            "dest_name": arr_info["city"],
+            "dest_country": arr_info["country"],
+            "pax_estimate": pax_estimate,
+            "flight_count": flight_count,
+            "origin_risk": risk,
+        })
+
+    return tuple(_FLIGHT_ARCS.validate_python(arcs))
+
 
 def generate_synthetic_arcs(
     target_date: date,
     min_passengers: int = 0,
     origin_country: Optional[str] = None,
     dest_country: Optional[str] = None,
-) -> List[FlightArc]:
-    """Generate synthetic flight arc data for visualization."""
-    arcs = []
-    hubs = list(AIRPORT_HUBS.items())
+    directed: bool = True,
+) -> Tuple[FlightArc, ...]:
+    """
+    Generate synthetic flight arc data for visualization.
 
-    # Use date as seed for consistent results
-    seed = int(target_date.strftime("%Y%m%d"))
-    random.seed(seed)
-
-    # Generate routes between major hubs
-    for i, (dep_code, dep_info) in enumerate(hubs):
-        # Filter by origin country if specified
-        if origin_country and dep_info["country"] != origin_country:
-            continue
-
-        # Each hub connects to 5-10 other hubs
-        num_destinations = random.randint(5, 10)
-        destinations = random.sample(hubs, min(num_destinations, len(hubs)))
-
-        for arr_code, arr_info in destinations:
-            if arr_code == dep_code:
-                continue
-
-            # Filter by destination country if specified
-            if dest_country and arr_info["country"] != dest_country:
-                continue
-
-            # Generate passenger estimate (varies by route importance)
-            base_pax = random.randint(200, 2000)
-            # Major hub connections get more traffic
-            if dep_code in ["JFK", "LHR", "DXB", "SIN"] or arr_code in ["JFK", "LHR", "DXB", "SIN"]:
-                base_pax *= 2
-
-            if base_pax < min_passengers:
-                continue
-
-            # Generate flight count
-            flights = max(1, base_pax // 180)  # Avg 180 pax per flight
-
-            # Create arc ID
-            arc_id = hashlib.md5(
-                f"{dep_code}-{arr_code}-{target_date}".encode()
-            ).hexdigest()[:12]
-
-            # Add some risk variation
-            origin_risk = dep_info["risk"] + random.uniform(-10, 10)
-            origin_risk = max(0, min(100, origin_risk))
-
-            arcs.append(FlightArc(
-                arc_id=f"arc_{arc_id}",
-                origin_lat=dep_info["lat"],
-                origin_lon=dep_info["lon"],
-                origin_name=dep_info["city"],
-                origin_country=dep_info["country"],
-                dest_lat=arr_info["lat"],
-                dest_lon=arr_info["lon"],
-                dest_name=arr_info["city"],
-                dest_country=arr_info["country"],
-                pax_estimate=base_pax,
-                flight_count=flights,
-                origin_risk=origin_risk,
-            ))
-
-    random.seed()  # Reset seed
-    return arcs
+    Filters are applied per request to the date's raw routes and select
+    from its memoized arcs, so a filtered result is a subset of the
+    unfiltered one and its arcs are shared (must not be mutated). With
+    directed=False, a route and its reverse give one arc (the busier one).
+    """
+    dep_idx, arr_idx, pax, _, _ = _synthetic_routes(target_date)
+
+    # Filter by minimum passengers and origin/destination country if specified
+    keep = pax >= min_passengers
+    if origin_country:
+        keep &= _HUB_COUNTRIES[dep_idx] == origin_country
+    if dest_country:
+        keep &= _HUB_COUNTRIES[arr_idx] == dest_country
+    routes = np.flatnonzero(keep)
+
+    if not directed:
+        # One route per unordered hub pair: the first of each pair when
+        # ordered by passengers (descending), then back in route order
+        n_hubs = len(_HUB_INFO)
+        pair = np.minimum(dep_idx, arr_idx) * n_hubs + np.maximum(dep_idx, arr_idx)
+        busiest_first = routes[np.argsort(-pax[routes], kind="stable")]
+        _, first = np.unique(pair[busiest_first], return_index=True)
+        routes = np.sort(busiest_first[first])
+
+    arcs = _synthetic_arcs(target_date)
+    return tuple(arcs[r] for r in routes.tolist())
 
 
 @router.get("/arcs", response_model=FlightArcsResponse)
@@ -181,13 +239,18 @@ async def get_flight_arcs(
     min_pax: int = Query(0, description="Minimum passengers to include"),
     origin_country: Optional[str] = Query(None, description="Filter by origin country code"),
     dest_country: Optional[str] = Query(None, description="Filter by destination country code"),
+    directed: bool = Query(True, description="Set false to merge each route with its reverse"),
+    limit: int = Query(500, ge=1, le=500, description="Maximum number of arcs to return"),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get flight arcs for visualization.
 
     Returns flight routes between major hubs with passenger estimates
-    and origin risk scores.
+    and origin risk scores. Undirected requests keep only the busier
+    direction of each pair of locations. At most `limit` arcs are
+    returned, busiest first when capped, and `total` counts the arcs
+    returned.
     """
     if date_str:
         try:
@@ -224,6 +287,7 @@ async def get_flight_arcs(
         "start_date": target_date - timedelta(days=1),
         "end_date": target_date,
         "min_pax": min_pax,
+        "limit": limit,
     }
 
     if origin_country:
@@ -234,7 +298,18 @@ async def get_flight_arcs(
         query += " AND dl.iso_code = :dest_country"
         params["dest_country"] = dest_country
 
-    query += " ORDER BY va.passenger_volume DESC LIMIT 500"
+    if directed:
+        query += " ORDER BY va.passenger_volume DESC LIMIT :limit"
+    else:
+        # Keep the busiest row of each unordered location pair in SQL, before
+        # the LIMIT, so reverse-direction rows don't use up result slots
+        pair = (
+            "LEAST(va.origin_location_id, va.dest_location_id), "
+            "GREATEST(va.origin_location_id, va.dest_location_id)"
+        )
+        query = query.replace("SELECT", f"SELECT DISTINCT ON ({pair})", 1)
+        query += f" ORDER BY {pair}, va.passenger_volume DESC"
+        query = f"SELECT * FROM ({query}) pairs ORDER BY pax_estimate DESC LIMIT :limit"
 
     result = await db.execute(text(query), params)
     rows = result.fetchall()
@@ -249,12 +324,15 @@ async def get_flight_arcs(
             min_passengers=min_pax,
             origin_country=origin_country,
             dest_country=dest_country,
+            directed=directed,
         )
-        return FlightArcsResponse(
-            arcs=arcs,
+        if len(arcs) > limit:
+            arcs = heapq.nlargest(limit, arcs, key=attrgetter("pax_estimate"))
+        return model_response(FlightArcsResponse(
+            arcs=list(arcs),
             total=len(arcs),
             date=target_date.isoformat(),
-        )
+        ))
 
     arcs = [
         FlightArc(
@@ -274,11 +352,11 @@ async def get_flight_arcs(
         for row in rows
     ]
 
-    return FlightArcsResponse(
+    return model_response(FlightArcsResponse(
         arcs=arcs,
         total=len(arcs),
         date=target_date.isoformat(),
-    )
+    ))
 
 
 @router.get("/import-pressure/{location_id}", response_model=ImportPressureResponse)
@@ -335,28 +413,37 @@ async def get_import_pressure(
             dest_country=target_hub[1]["country"],
         )
 
-        sources = []
-        total_pressure = 0.0
-        for arc in arcs:
-            if arc.dest_country == target_hub[1]["country"]:
-                risk_contribution = (arc.pax_estimate * (arc.origin_risk or 50)) / 10000
-                total_pressure += risk_contribution
-                sources.append(ImportPressureSource(
-                    origin_name=arc.origin_name,
-                    origin_country=arc.origin_country,
-                    passengers=arc.pax_estimate,
-                    risk_contribution=risk_contribution,
-                ))
-
-        import_pressure = min(100, total_pressure / max(1, len(sources)) * 2)
-        sources.sort(key=lambda x: x.risk_contribution, reverse=True)
-
-        return ImportPressureResponse(
+        # Arcs are already filtered to the target country, so every arc is
+        # a source; weight them all in one vectorized pass
+        pax = np.fromiter((arc.pax_estimate for arc in arcs), np.int64, len(arcs))
+        risk = np.fromiter(
+            ((arc.origin_risk or 50) for arc in arcs), np.float64, len(arcs)
+        )
+        contributions = pax * risk / 10000
+        total_pressure = float(contributions.sum())
+        import_pressure = min(100, total_pressure / max(1, len(arcs)) * 2)
+
+        # Top 10 by contribution; ties keep arc order like a stable sort
+        top = np.arange(len(arcs))
+        if len(arcs) > 10:
+            top = np.argpartition(-contributions, 9)[:10]
+        top = top[np.lexsort((top, -contributions[top]))]
+        sources = [
+            ImportPressureSource(
+                origin_name=arcs[i].origin_name,
+                origin_country=arcs[i].origin_country,
+                passengers=arcs[i].pax_estimate,
+                risk_contribution=contributions[i],
+            )
+            for i in top.tolist()
+        ]
+
+        return model_response(ImportPressureResponse(
             location_id=location_id,
             import_pressure=import_pressure,
-            top_sources=sources[:10],
+            top_sources=sources,
             timestamp=datetime.utcnow().isoformat() + "Z",
-        )
+        ))
 
     # Calculate from real data
     total_pressure = 0.0
@@ -381,9 +468,9 @@ async def get_import_pressure(
     # Normalize to 0-100 scale
     import_pressure = min(100, total_pressure / max(1, len(sources)) * 2)
 
-    return ImportPressureResponse(
+    return model_response(ImportPressureResponse(
         location_id=location_id,
         import_pressure=round(import_pressure, 1),
         top_sources=sources[:10],
         timestamp=datetime.utcnow().isoformat() + "Z",
-    )
+    ))
@@ -2,6 +2,7 @@
 Health check endpoints
 """
 
+import asyncio
 from datetime import datetime
 
 import structlog
@@ -9,8 +10,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import cache
 from app.core.database import get_db
-from app.core.cache import redis_client
 from app.core.config import settings
 
 logger = structlog.get_logger()
@@ -27,28 +28,38 @@ async def health_check():
     }
 
 
-@router.get("/health/ready")
-async def readiness_check(db: AsyncSession = Depends(get_db)):
-    """Readiness check - verifies all dependencies are available."""
-    checks = {
-        "database": False,
-        "cache": False,
-    }
-
-    # Check database
+async def _database_ok(db: AsyncSession) -> bool:
+    """Check the database answers a trivial query."""
     try:
         await db.execute(text("SELECT 1"))
-        checks["database"] = True
+        return True
     except Exception as e:
         logger.error("Database health check failed", error=str(e))
+        return False
+
 
-    # Check Redis
+async def _cache_ok() -> bool:
+    """Check Redis answers a ping."""
+    # Looked up on the module: init_cache() sets the client after import
+    if not cache.redis_client:
+        return False
     try:
-        if redis_client:
-            await redis_client.ping()
-            checks["cache"] = True
+        await cache.redis_client.ping()
+        return True
     except Exception as e:
         logger.error("Redis health check failed", error=str(e))
+        return False
+
+
+@router.get("/health/ready")
+async def readiness_check(db: AsyncSession = Depends(get_db)):
+    """Readiness check - verifies all dependencies are available."""
+    # Probe the database and Redis concurrently
+    database_ok, cache_ok = await asyncio.gather(_database_ok(db), _cache_ok())
+    checks = {
+        "database": database_ok,
+        "cache": cache_ok,
+    }
 
     all_healthy = all(checks.values())
 
@@ -5,19 +5,28 @@ Provides access to historical surveillance and risk data for trend analysis.
 """
 
 from datetime import datetime, date, timedelta
-from typing import Optional, List
+from functools import lru_cache
+from operator import attrgetter
+from typing import Optional, List, Tuple
 import random
 import hashlib
 import logging
 
+import numpy as np
 from fastapi import APIRouter, Query, HTTPException, Depends
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.responses import model_response
 
-router = APIRouter(prefix="/api/history", tags=["history"])
+router = APIRouter(
+    prefix="/api/history",
+    tags=["history"],
+    default_response_class=ORJSONResponse,
+)
 
 
 class HistoricalDataPoint(BaseModel):
@@ -28,6 +37,9 @@ class HistoricalDataPoint(BaseModel):
     variants: List[str] = []
 
 
+_HISTORICAL_POINTS = TypeAdapter(List[HistoricalDataPoint])
+
+
 class HistoricalDataResponse(BaseModel):
     data: List[HistoricalDataPoint]
     locations: int
@@ -80,6 +92,9 @@ class VariantCompositionResponse(BaseModel):
     date_range: dict
 
 
+# Metrics available to the timeseries and compare endpoints
+METRICS = ("risk_score", "velocity")
+
 # Sample variants for synthetic data
 VARIANTS = [
     "BA.2.86",
@@ -92,60 +107,122 @@ VARIANTS = [
 ]
 
 
-def generate_historical_data(
-    location_ids: List[str],
+@lru_cache(maxsize=4096)
+def _location_seed(key: str) -> int:
+    """Stable 32-bit seed for a location ID (first 8 hex digits of its MD5)."""
+    return int(hashlib.md5(key.encode()).hexdigest()[:8], 16)
+
+
+def _mean_reverting_walk(base: float, noise: List[float], drift: List[float]):
+    """
+    Clipped random walk pulled back towards base; returns (scores, changes).
+
+    Each score depends on the previous one, so only this recurrence is a
+    scalar loop; the changes are recovered from the scores as an array.
+    Locations are independent, but stepping them together as arrays (one
+    vector update per day) is slower for a single location and no faster
+    for the 10 that compare_locations allows, so each walks on its own.
+    """
+    scores = [base]
+    prev = base
+    for step, seasonal in zip(noise, drift):
+        prev = max(0.0, min(100.0, prev + (step + 0.1 * (base - prev)) + seasonal))
+        scores.append(prev)
+    scores = np.array(scores)
+    changes = np.asarray(noise) + 0.1 * (base - scores[:-1])
+    return scores[1:], changes
+
+
+@lru_cache(maxsize=1024)
+def _location_series(
+    loc_id: str,
     start_date: date,
     end_date: date,
-    granularity: str = "daily",
-) -> List[HistoricalDataPoint]:
-    """Generate synthetic historical data for locations."""
-    data_points = []
+    granularity: str,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Synthetic series for one location, memoized per location and period.
 
+    Returns (risk scores, velocities, variant indices), already rounded.
+    Only these compact read-only arrays are cached (a few KB per year of
+    daily points), since every part of the key comes from the client;
+    the response models are built from them per request.
+    """
     # Determine date step based on granularity
-    if granularity == "weekly":
-        date_step = timedelta(days=7)
-    else:
-        date_step = timedelta(days=1)
+    step_days = 7 if granularity == "weekly" else 1
+    day_offsets = np.arange(0, (end_date - start_date).days + 1, step_days)
+    n_points = len(day_offsets)
 
-    for loc_id in location_ids:
-        # Use location_id as seed for consistent results
-        seed = int(hashlib.md5(loc_id.encode()).hexdigest()[:8], 16)
-        random.seed(seed)
+    # Seasonal drift term
+    seasonal_drift = (10 * (0.5 + 0.5 * (1 + (day_offsets % 90 - 45) / 45)) * 0.1).tolist()
 
-        # Generate base risk level for this location
-        base_risk = random.uniform(20, 70)
+    # Use location_id as seed for consistent results
+    rng = np.random.default_rng(_location_seed(loc_id))
 
-        current_date = start_date
-        prev_score = base_risk
+    # Generate base risk level and all random draws for this location
+    base_risk = rng.uniform(20, 70)
+    noise = rng.normal(0, 5, n_points).tolist()
+    variant_order = rng.random((n_points, len(VARIANTS))).argsort(axis=1)
 
-        while current_date <= end_date:
-            # Add some temporal variation
-            day_offset = (current_date - start_date).days
-            seasonal = 10 * (0.5 + 0.5 * (1 + (day_offset % 90 - 45) / 45))
+    # Random walk with mean reversion, clipped to [0, 100]
+    risk_scores, changes = _mean_reverting_walk(base_risk, noise, seasonal_drift)
 
-            # Random walk with mean reversion
-            change = random.gauss(0, 5) + 0.1 * (base_risk - prev_score)
-            risk_score = max(0, min(100, prev_score + change + seasonal * 0.1))
+    # Calculate velocity (week-over-week change)
+    velocities = changes / 7 if granularity == "weekly" else changes
 
-            # Calculate velocity (week-over-week change)
-            velocity = change / 7 if granularity == "weekly" else change
+    # Select variants (more likely to have dominant variant at higher risk);
+    # -1 marks the unused slots of points with fewer than 3 variants
+    num_variants = np.where(risk_scores < 30, 1, np.where(risk_scores < 60, 2, 3))
+    variant_idx = np.where(
+        np.arange(3) < num_variants[:, None], variant_order[:, :3], -1
+    ).astype(np.int8)
 
-            # Select variants (more likely to have dominant variant at higher risk)
-            num_variants = 1 if risk_score < 30 else (2 if risk_score < 60 else 3)
-            variants = random.sample(VARIANTS, min(num_variants, len(VARIANTS)))
+    series = (np.round(risk_scores, 1), np.round(velocities, 2), variant_idx)
+    for arr in series:
+        arr.flags.writeable = False
+    return series
 
-            data_points.append(HistoricalDataPoint(
-                location_id=loc_id,
-                date=current_date.isoformat(),
-                risk_score=round(risk_score, 1),
-                velocity=round(velocity, 2),
-                variants=variants,
-            ))
 
-            prev_score = risk_score
-            current_date += date_step
+def _location_history(
+    loc_id: str,
+    start_date: date,
+    end_date: date,
+    granularity: str,
+) -> List[HistoricalDataPoint]:
+    """Synthetic history points for one location, built from its cached series."""
+    risk_scores, velocities, variant_idx = _location_series(
+        loc_id, start_date, end_date, granularity
+    )
+    step_days = 7 if granularity == "weekly" else 1
+    dates = (
+        np.datetime64(start_date, "D") + np.arange(len(risk_scores)) * step_days
+    ).astype(str).tolist()
 
-    random.seed()  # Reset seed
+    # Validate all points in one call rather than one model at a time
+    return _HISTORICAL_POINTS.validate_python([
+        {
+            "location_id": loc_id,
+            "date": day,
+            "risk_score": risk_score,
+            "velocity": velocity,
+            "variants": [VARIANTS[j] for j in idx if j >= 0],
+        }
+        for day, risk_score, velocity, idx in zip(
+            dates, risk_scores.tolist(), velocities.tolist(), variant_idx.tolist()
+        )
+    ])
+
+
+def generate_historical_data(
+    location_ids: List[str],
+    start_date: date,
+    end_date: date,
+    granularity: str = "daily",
+) -> List[HistoricalDataPoint]:
+    """Generate synthetic historical data for locations."""
+    data_points = []
+    for loc_id in location_ids:
+        data_points.extend(_location_history(loc_id, start_date, end_date, granularity))
     return data_points
 
 
@@ -236,11 +313,11 @@ async def get_historical_data(
             end_date=end,
             granularity=granularity,
         )
-        return HistoricalDataResponse(
+        return model_response(HistoricalDataResponse(
             data=data,
             locations=len(locations),
             date_range={"start": start_date, "end": end_date},
-        )
+        ))
 
     data = [
         HistoricalDataPoint(
@@ -253,11 +330,11 @@ async def get_historical_data(
         for row in rows
     ]
 
-    return HistoricalDataResponse(
+    return model_response(HistoricalDataResponse(
         data=data,
         locations=len(set(d.location_id for d in data)),
         date_range={"start": start_date, "end": end_date},
-    )
+    ))
 
 
 @router.get("/timeseries/{location_id}", response_model=TimeSeriesResponse)
@@ -272,6 +349,9 @@ async def get_timeseries(
 
     Useful for charting and trend analysis.
     """
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail="metric must be 'risk_score' or 'velocity'")
+
     end_date = date.today()
     start_date = end_date - timedelta(days=days)
 
@@ -309,34 +389,34 @@ async def get_timeseries(
             end_date=end_date,
             granularity="daily",
         )
-        series = []
-        for point in data:
-            value = getattr(point, metric, None)
-            if value is not None:
-                confidence_margin = abs(value) * 0.15
-                series.append(TimeSeriesPoint(
-                    date=point.date,
-                    value=value,
-                    confidence_low=max(0, value - confidence_margin),
-                    confidence_high=min(100, value + confidence_margin) if metric == "risk_score" else value + confidence_margin,
-                ))
-        return TimeSeriesResponse(
+        # Metric values for all points at once, with a +/-15% confidence band
+        get_value = attrgetter(metric)
+        points = [point for point in data if get_value(point) is not None]
+        values = np.array([get_value(point) for point in points], dtype=float)
+        confidence_margin = np.abs(values) * 0.15
+        confidence_low = np.maximum(0, values - confidence_margin)
+        confidence_high = values + confidence_margin
+        if metric == "risk_score":
+            np.minimum(confidence_high, 100, out=confidence_high)
+        series = [
+            TimeSeriesPoint(date=point.date, value=value, confidence_low=low, confidence_high=high)
+            for point, value, low, high in zip(
+                points, values.tolist(), confidence_low.tolist(), confidence_high.tolist()
+            )
+        ]
+        return model_response(TimeSeriesResponse(
             location_id=location_id,
             metric=metric,
             series=series,
             start_date=start_date.isoformat(),
             end_date=end_date.isoformat(),
-        )
+        ))
 
     # Build time series from real data
+    get_value = attrgetter(metric)
     series = []
     for row in rows:
-        if metric == "risk_score":
-            value = float(row.risk_score) if row.risk_score else 0
-        elif metric == "velocity":
-            value = float(row.velocity) if row.velocity else 0
-        else:
-            value = 0
+        value = float(get_value(row)) if get_value(row) else 0
 
         # Use actual std dev for confidence intervals if available
         std_dev = float(row.std_dev) if row.std_dev else abs(value) * 0.15
@@ -348,13 +428,13 @@ async def get_timeseries(
             confidence_high=round(min(100, value + std_dev) if metric == "risk_score" else value + std_dev, 2),
         ))
 
-    return TimeSeriesResponse(
+    return model_response(TimeSeriesResponse(
         location_id=location_id,
         metric=metric,
         series=series,
         start_date=start_date.isoformat(),
         end_date=end_date.isoformat(),
-    )
+    ))
 
 
 @router.get("/compare")
@@ -372,6 +452,11 @@ async def compare_locations(
     if len(location_ids) > 10:
         raise HTTPException(status_code=400, detail="Maximum 10 locations for comparison")
 
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail="metric must be 'risk_score' or 'velocity'")
+
+    get_value = attrgetter(metric)
+
     end_date = date.today()
     start_date = end_date - timedelta(days=days)
 
@@ -415,13 +500,13 @@ async def compare_locations(
                 by_location[point.location_id] = []
             by_location[point.location_id].append({
                 "date": point.date,
-                "value": getattr(point, metric, None),
+                "value": get_value(point),
             })
-        return {
+        return ORJSONResponse({
             "metric": metric,
             "date_range": {"start": start_date.isoformat(), "end": end_date.isoformat()},
             "locations": by_location,
-        }
+        })
 
     # Organize by location from real data
     by_location = {}
@@ -430,23 +515,18 @@ async def compare_locations(
         if loc_id not in by_location:
             by_location[loc_id] = []
 
-        if metric == "risk_score":
-            value = round(float(row.risk_score), 2) if row.risk_score else None
-        elif metric == "velocity":
-            value = round(float(row.velocity), 2) if row.velocity else None
-        else:
-            value = None
+        value = round(float(get_value(row)), 2) if get_value(row) else None
 
         by_location[loc_id].append({
             "date": row.date.isoformat() if hasattr(row.date, 'isoformat') else str(row.date),
             "value": value,
         })
 
-    return {
+    return ORJSONResponse({
         "metric": metric,
         "date_range": {"start": start_date.isoformat(), "end": end_date.isoformat()},
         "locations": by_location,
-    }
+    })
 
 
 @router.get("/summary")
@@ -503,17 +583,18 @@ async def get_historical_summary(
         if not data:
             raise HTTPException(status_code=404, detail="No data found for location")
 
-        risk_scores = [p.risk_score for p in data if p.risk_score is not None]
-        velocities = [p.velocity for p in data if p.velocity is not None]
+        # One pass over the points into arrays, then NumPy reductions
+        risk_scores = np.array([p.risk_score for p in data if p.risk_score is not None], dtype=float)
+        velocities = np.array([p.velocity for p in data if p.velocity is not None], dtype=float)
 
-        avg_risk = sum(risk_scores) / len(risk_scores) if risk_scores else 0
-        max_risk = max(risk_scores) if risk_scores else 0
-        min_risk = min(risk_scores) if risk_scores else 0
-        avg_velocity = sum(velocities) / len(velocities) if velocities else 0
+        avg_risk = float(risk_scores.mean()) if risk_scores.size else 0
+        max_risk = float(risk_scores.max()) if risk_scores.size else 0
+        min_risk = float(risk_scores.min()) if risk_scores.size else 0
+        avg_velocity = float(velocities.mean()) if velocities.size else 0
 
-        if len(risk_scores) >= 7:
-            recent_avg = sum(risk_scores[-7:]) / 7
-            earlier_avg = sum(risk_scores[:7]) / 7
+        if risk_scores.size >= 7:
+            recent_avg = risk_scores[-7:].mean()
+            earlier_avg = risk_scores[:7].mean()
             if recent_avg > earlier_avg + 5:
                 trend = "rising"
             elif recent_avg < earlier_avg - 5:
@@ -523,11 +604,9 @@ async def get_historical_summary(
         else:
             trend = "insufficient_data"
 
-        all_variants = set()
-        for p in data:
-            all_variants.update(p.variants)
+        all_variants = sorted(set().union(*(p.variants for p in data)))
 
-        return {
+        return ORJSONResponse({
             "location_id": location_id,
             "period": {"start": start_date.isoformat(), "end": end_date.isoformat(), "days": days},
             "statistics": {
@@ -538,8 +617,8 @@ async def get_historical_summary(
                 "data_points": len(data),
             },
             "trend": trend,
-            "variants_observed": list(all_variants),
-        }
+            "variants_observed": all_variants,
+        })
 
     # Query for trend calculation (recent vs earlier)
     trend_query = """
@@ -580,7 +659,7 @@ async def get_historical_summary(
     else:
         trend = "stable"
 
-    return {
+    return ORJSONResponse({
         "location_id": location_id,
         "period": {"start": start_date.isoformat(), "end": end_date.isoformat(), "days": days},
         "statistics": {
@@ -592,7 +671,7 @@ async def get_historical_summary(
         },
         "trend": trend,
         "variants_observed": row.variants if row.variants else [],
-    }
+    })
 
 
 # Variant colors for visualization
@@ -617,8 +696,7 @@ def generate_variant_waves(
     total_days = (end_date - start_date).days
 
     # Seed for consistency
-    seed_str = location_id or "global"
-    seed = int(hashlib.md5(seed_str.encode()).hexdigest()[:8], 16)
+    seed = _location_seed(location_id or "global")
     random.seed(seed)
 
     # Generate overlapping waves for major variants
@@ -664,7 +742,7 @@ def generate_variant_composition(
     granularity: str = "daily",
 ) -> List[VariantCompositionPoint]:
     """Generate synthetic variant composition data over time."""
-    seed = int(hashlib.md5(location_id.encode()).hexdigest()[:8], 16)
+    seed = _location_seed(location_id)
     random.seed(seed)
 
     date_step = timedelta(days=7) if granularity == "weekly" else timedelta(days=1)
@@ -733,11 +811,11 @@ async def get_variant_waves(
 
     waves = generate_variant_waves(start_date, end_date, location_id)
 
-    return VariantWavesResponse(
+    return model_response(VariantWavesResponse(
         waves=waves,
         date_range={"start": start_date.isoformat(), "end": end_date.isoformat()},
         location_id=location_id,
-    )
+    ))
 
 
 @router.get("/variant-composition/{location_id}", response_model=VariantCompositionResponse)
@@ -765,9 +843,9 @@ async def get_variant_composition(
     for point in series:
         all_variants.update(point.variants.keys())
 
-    return VariantCompositionResponse(
+    return model_response(VariantCompositionResponse(
         location_id=location_id,
         series=series,
         variants=sorted(list(all_variants)),
         date_range={"start": start_date.isoformat(), "end": end_date.isoformat()},
-    )
+    ))
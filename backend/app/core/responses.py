@@ -0,0 +1,28 @@
+"""
+Response helpers
+"""
+
+from typing import Any
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def _model_fields(obj: Any) -> dict:
+    """orjson default hook: encode models from their field values as-is."""
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError
+
+
+def model_response(model: BaseModel) -> Response:
+    """
+    Encode a response model straight to JSON bytes.
+
+    orjson walks the models' field values directly, skipping FastAPI's
+    response_model re-serialization to a dict and pydantic's own serializer.
+    Use only where the model already is the declared response_model, and
+    for plain models (no aliases, custom serializers or computed fields).
+    """
+    return Response(content=orjson.dumps(model, default=_model_fields), media_type="application/json")
@@ -203,6 +203,15 @@ class TestFlightEndpoints:
         for arc in data["arcs"]:
             assert arc["pax_estimate"] >= 500
 
+    def test_get_flight_arcs_limit(self, client):
+        """Test limit caps the number of arcs returned."""
+        response = client.get("/api/flights/arcs?limit=10")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["arcs"]) <= 10
+        assert data["total"] == len(data["arcs"])
+
     def test_get_import_pressure(self, client):
         """Test GET /api/flights/import-pressure/{id}."""
         response = client.get("/api/flights/import-pressure/loc_us_new_york")
@@ -213,6 +222,32 @@ class TestFlightEndpoints:
         assert "top_sources" in data
         assert 0 <= data["import_pressure"] <= 100
 
+    def test_synthetic_arcs_memoized(self):
+        """Test synthetic arcs are deterministic and shared per date only."""
+        from app.api.flights import _synthetic_arcs, generate_synthetic_arcs
+
+        arcs = generate_synthetic_arcs(date(2026, 1, 10), min_passengers=500)
+        all_arcs = generate_synthetic_arcs(date(2026, 1, 10))
+
+        assert all(arc.pax_estimate >= 500 for arc in arcs)
+        assert set(map(id, arcs)) <= set(map(id, all_arcs))
+        assert _synthetic_arcs.cache_info().currsize == 1
+        _synthetic_arcs.cache_clear()
+        assert generate_synthetic_arcs(date(2026, 1, 10), min_passengers=500) == arcs
+
+    def test_synthetic_arcs_undirected(self):
+        """Test undirected arcs keep one arc per hub pair."""
+        from app.api.flights import generate_synthetic_arcs
+
+        arcs = generate_synthetic_arcs(date(2026, 1, 10), directed=False)
+        pairs = [frozenset((arc.origin_name, arc.dest_name)) for arc in arcs]
+
+        assert len(pairs) == len(set(pairs))
+        assert set(pairs) == {
+            frozenset((arc.origin_name, arc.dest_name))
+            for arc in generate_synthetic_arcs(date(2026, 1, 10))
+        }
+
 
 class TestHistoryEndpoints:
     """Tests for historical data endpoints."""
@@ -304,6 +339,12 @@ class TestAPIValidation:
 
         assert response.status_code == 400
 
+    def test_unknown_metric_rejected(self, client):
+        """Test unknown history metrics are rejected."""
+        response = client.get("/api/history/timeseries/loc_us_new_york?metric=unknown")
+
+        assert response.status_code == 400
+
     def test_special_characters_in_search(self, client):
         """Test special characters are handled in search."""
         response = client.get("/api/search?q=%3Cscript%3E")